@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import argparse
-import shutil
-from dataclasses import dataclass
+import errno
+import os
+import threading
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 """
@@ -123,12 +128,13 @@ CATEGORIES: Dict[str, List[str]] = {
 
 DEFAULT_OTHER_CATEGORY = "Otros"
 
-
-@dataclass
-class MovePlan:
-    source: Path
-    destination: Path
-    category: str
+# Mapa plano extensión -> categoría, calculado una sola vez al importar.
+# Las extensiones de CATEGORIES ya están en minúsculas, así que el dict es canónico.
+EXT_TO_CATEGORY: Dict[str, str] = {
+    extension: category_name
+    for category_name, extensions in CATEGORIES.items()
+    for extension in extensions
+}
 
 
 def get_downloads_folder() -> Path:
@@ -136,12 +142,55 @@ def get_downloads_folder() -> Path:
     return Path.home() / "Downloads"
 
 
+# El espacio de extensiones reales es chico, así que la cache acierta casi
+# siempre y se ahorra el .lower() en llamadas repetidas.
+@lru_cache(maxsize=256)
 def infer_category_from_extension(extension: str) -> str:
-    lower_extension = extension.lower()
-    for category_name, extensions in CATEGORIES.items():
-        if lower_extension in extensions:
-            return category_name
-    return DEFAULT_OTHER_CATEGORY
+    return EXT_TO_CATEGORY.get(extension.lower(), DEFAULT_OTHER_CATEGORY)
+
+
+# A partir de esta cantidad de archivos conviene categorizar con NumPy
+# (si está instalado) en lugar de un lookup de dict por archivo.
+NUMPY_CATEGORIZATION_THRESHOLD = 50_000
+
+
+def _extension_key(name: str) -> str:
+    """Clave de búsqueda para un nombre de archivo, en minúsculas.
+
+    Prefiere la extensión compuesta (.tar.gz, .tar.bz2, ...) si está en la
+    tabla; si no, el sufijo simple.
+    """
+    stem, ext = os.path.splitext(name)
+    ext = ext.lower()
+    compound = os.path.splitext(stem)[1].lower() + ext
+    return compound if compound in EXT_TO_CATEGORY else ext
+
+
+def _infer_categories_numpy(names: List[str]) -> List[str]:
+    """Asigna categoría a todos los nombres con una búsqueda binaria vectorizada.
+
+    Una sola llamada a np.searchsorted sobre la tabla ordenada de extensiones
+    reemplaza N lookups de dict en Python; paga a partir de cientos de miles
+    de archivos.
+    """
+    import numpy as np
+
+    # '<U8' alcanza: la clave más larga de la tabla es '.tar.bz2'
+    exts = np.array([_extension_key(name) for name in names], dtype='<U8')
+    sorted_keys = np.array(sorted(EXT_TO_CATEGORY), dtype='<U8')
+    sorted_cats = np.array([EXT_TO_CATEGORY[key] for key in sorted_keys])
+    idx = np.searchsorted(sorted_keys, exts).clip(max=len(sorted_keys) - 1)
+    hit = sorted_keys[idx] == exts
+    return np.where(hit, sorted_cats[idx], DEFAULT_OTHER_CATEGORY).tolist()
+
+
+def _infer_categories(names: List[str]) -> List[str]:
+    if len(names) >= NUMPY_CATEGORIZATION_THRESHOLD:
+        try:
+            return _infer_categories_numpy(names)
+        except ImportError:
+            pass
+    return [EXT_TO_CATEGORY.get(_extension_key(name), DEFAULT_OTHER_CATEGORY) for name in names]
 
 
 def is_hidden_file(path: Path) -> bool:
@@ -149,71 +198,163 @@ def is_hidden_file(path: Path) -> bool:
     return name.startswith(".")
 
 
+# Tamaño del lote de escaneo: mantiene la memoria plana y es lo bastante
+# grande para que la categorización vectorizada con NumPy siga pagando.
+SCAN_CHUNK_SIZE = 65_536
+
+
 def build_move_plan_for_directory(
     directory: Path,
     *,
     include_hidden: bool = False,
-) -> List[MovePlan]:
+) -> Iterator[Tuple[Path, Path, str]]:
+    """Genera planes (origen, destino, categoría) a medida que escanea.
+
+    Devolver un generador en lugar de materializar listas completas mantiene
+    la memoria plana en directorios enormes y permite solapar el escaneo del
+    disco con los renames del consumidor.
+    """
     if not directory.exists() or not directory.is_dir():
         raise ValueError(f"La ruta objetivo no es válida: {directory}")
 
-    plans: List[MovePlan] = []
-    for child in directory.iterdir():
-        if child.is_dir():
-            continue
-        if not include_hidden and is_hidden_file(child):
-            continue
-
-        file_extension = child.suffix.lower()
-        category = infer_category_from_extension(file_extension)
-        destination_dir = directory / category
-        destination = destination_dir / child.name
-        plans.append(MovePlan(source=child, destination=destination, category=category))
-
-    return plans
-
-
-def ensure_directory(path: Path) -> None:
-    if not path.exists():
-        path.mkdir(parents=True, exist_ok=True)
-
-
-def generate_unique_destination_path(destination: Path) -> Path:
-    """Si existe un archivo con el mismo nombre, genera un nombre único con sufijo.
+    return _iter_move_plans(directory, include_hidden)
+
+
+def _iter_move_plans(directory: Path, include_hidden: bool) -> Iterator[Tuple[Path, Path, str]]:
+    destination_dirs: Dict[str, Path] = {}
+    # os.scandir evita crear un Path y hacer stat extra por cada entrada
+    with os.scandir(directory) as it:
+        filtered = (
+            entry
+            for entry in it
+            # is_dir() sigue symlinks (como el Path.is_dir() original): un
+            # symlink a una carpeta se salta, no se mueve como archivo. Para
+            # entradas regulares usa igual el d_type cacheado del scandir.
+            if not entry.is_dir()
+            and (include_hidden or not entry.name.startswith("."))
+        )
+        while True:
+            entries = list(islice(filtered, SCAN_CHUNK_SIZE))
+            if not entries:
+                break
+            # Categorización en bloque por lote: dict lookup por nombre, o
+            # searchsorted vectorizado si el lote es enorme y hay NumPy
+            categories = _infer_categories([entry.name for entry in entries])
+            for entry, category in zip(entries, categories):
+                destination_dir = destination_dirs.get(category)
+                if destination_dir is None:
+                    destination_dir = directory / category
+                    destination_dirs[category] = destination_dir
+                yield Path(entry.path), destination_dir / entry.name, category
+
+
+def generate_unique_destination_path(destination: Path, taken: set) -> Path:
+    """Si el nombre ya está ocupado en el destino, genera uno único con sufijo.
 
     Ejemplo: archivo.txt -> archivo (1).txt, archivo (2).txt, ...
+
+    Trabaja contra un conjunto en memoria de nombres ya ocupados en la carpeta
+    destino (sin llamadas a exists() por candidato) y registra el nombre elegido.
     """
-    if not destination.exists():
+    name = destination.name
+    if name not in taken:
+        taken.add(name)
         return destination
 
     stem = destination.stem
     suffix = destination.suffix
-    parent = destination.parent
 
     counter = 1
     while True:
-        candidate = parent / f"{stem} ({counter}){suffix}"
-        if not candidate.exists():
-            return candidate
+        candidate_name = f"{stem} ({counter}){suffix}"
+        if candidate_name not in taken:
+            taken.add(candidate_name)
+            return destination.parent / candidate_name
         counter += 1
 
 
-def apply_move_plan(plans: Iterable[MovePlan], *, dry_run: bool = False) -> Tuple[int, Dict[str, int]]:
-    moved_count = 0
-    per_category: Dict[str, int] = {}
+# Tamaño del lote de movimientos despachados al pool por vez
+MOVE_CHUNK_SIZE = 4_096
 
-    for plan in plans:
-        ensure_directory(plan.destination.parent)
-        unique_destination = generate_unique_destination_path(plan.destination)
 
-        if dry_run:
-            print(f"DRY-RUN: movería '{plan.source.name}' -> '{plan.destination.parent.name}/{unique_destination.name}'")
-        else:
-            shutil.move(str(plan.source), str(unique_destination))
-            moved_count += 1
-            per_category[plan.category] = per_category.get(plan.category, 0) + 1
+def apply_move_plan(
+    plans: Iterable[Tuple[Path, Path, str]],
+    *,
+    dry_run: bool = False,
+) -> Tuple[int, Dict[str, int]]:
+    """Consume el plan (típicamente un generador) y ejecuta los movimientos.
 
-    return moved_count, per_category
+    Devuelve la cantidad de planes procesados (movidos, o planificados en
+    dry-run) y el detalle por categoría.
+    """
+    processed_count = 0
+    per_category: Counter = Counter()
+    existing_names: Dict[Path, set] = {}
+
+    def _prepare_parent(parent: Path) -> None:
+        # Primera vez que aparece esta carpeta destino: la creamos (salvo en
+        # dry-run) y cacheamos su listado con un único scandir, en lugar de
+        # un exists() por candidato de nombre.
+        if parent in existing_names:
+            return
+        if not dry_run:
+            parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with os.scandir(parent) as it:
+                existing_names[parent] = {entry.name for entry in it}
+        except FileNotFoundError:
+            existing_names[parent] = set()
+
+    if dry_run:
+        for source, destination, category in plans:
+            _prepare_parent(destination.parent)
+            taken = existing_names[destination.parent]
+            unique_destination = generate_unique_destination_path(destination, taken)
+            print(f"DRY-RUN: movería '{source.name}' -> '{destination.parent.name}/{unique_destination.name}'")
+            processed_count += 1
+            per_category[category] += 1
+        return processed_count, dict(per_category)
+
+    # Los renames son syscalls que liberan el GIL, así que un pool de hilos
+    # solapa su latencia. La asignación de nombres únicos se protege con un
+    # lock porque muta los sets compartidos de nombres ocupados.
+    names_lock = threading.Lock()
+
+    def _do_move(source: Path, destination: Path) -> None:
+        with names_lock:
+            taken = existing_names[destination.parent]
+            unique_destination = generate_unique_destination_path(destination, taken)
+        try:
+            # Mismo filesystem por construcción: un rename(2) directo, sin
+            # los stats/chequeos extra de shutil.move.
+            os.replace(source, unique_destination)
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+            # Destino en otro dispositivo: copiar y borrar. copy2 usa los
+            # caminos rápidos del kernel (sendfile/copy_file_range en Linux,
+            # CopyFile2 en Windows) en lugar del loop read/write en userspace.
+            # Import diferido: solo se paga si aparece este caso raro.
+            import shutil
+
+            shutil.copy2(source, unique_destination)
+            os.unlink(source)
+
+    plans_iter = iter(plans)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            chunk = list(islice(plans_iter, MOVE_CHUNK_SIZE))
+            if not chunk:
+                break
+            for _, destination, _ in chunk:
+                _prepare_parent(destination.parent)
+            # list() fuerza el consumo y propaga excepciones de los workers
+            list(executor.map(_do_move, (plan[0] for plan in chunk), (plan[1] for plan in chunk)))
+            processed_count += len(chunk)
+            per_category.update(plan[2] for plan in chunk)
+
+    return processed_count, dict(per_category)
 
 
 def parse_args() -> argparse.Namespace:
@@ -254,7 +395,7 @@ def main() -> None:
     moved_count, per_category = apply_move_plan(plans, dry_run=dry_run)
 
     if dry_run:
-        print(f"Se planificaron {len(list(plans))} archivos para mover.")
+        print(f"Se planificaron {moved_count} archivos para mover.")
     else:
         print(f"Archivos movidos: {moved_count}")
         if per_category:
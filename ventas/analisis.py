@@ -2,17 +2,40 @@ from __future__ import annotations
 
 from pathlib import Path
 import csv
-from typing import Dict, List
+import sys
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    # Solo para anotaciones: en runtime pandas se importa de forma diferida
+    # dentro de cargar_datos_csv
+    import pandas as pd
 
 
 # 1. Cargar datos del CSV
 # -----------------------------------------------------------------------------
-import pandas as pd
 
-def cargar_datos_csv(ruta: str = "ventas.csv") -> List[Dict[str, str]]:
-    """Carga el archivo CSV de ventas y devuelve una lista de filas (dict).
+# Por debajo de este tamaño usamos csv de la stdlib: importar pandas cuesta
+# cientos de ms y decenas de MB, desproporcionado para un archivo chico.
+UMBRAL_CSV_LIVIANO = 1 * 1024 * 1024  # 1 MiB
+
+
+def _cargar_filas_stdlib(ruta_path: Path) -> List[Dict[str, str]]:
+    """Carga un CSV chico con csv.DictReader, sin tocar pandas."""
+    with open(ruta_path, newline='', encoding='utf-8-sig') as f:
+        filas = [
+            {str(k).strip(): v.strip() for k, v in fila.items()}
+            for fila in csv.DictReader(f)
+        ]
+    return filas
+
 
-    - Usa pandas para la lectura.
+def cargar_datos_csv(ruta: str = "ventas.csv"):
+    """Carga el archivo CSV de ventas.
+
+    - Archivos chicos (< 1 MiB): csv de la stdlib, devuelve lista de filas
+      (dict) y evita el costo de importar pandas.
+    - Archivos grandes: pandas, devuelve el DataFrame directamente para que
+      el análisis posterior siga vectorizado.
     - Normaliza espacios en blanco alrededor de claves/valores.
     - Usa codificación UTF-8 con firma (maneja BOM si existe).
     """
@@ -20,31 +43,103 @@ def cargar_datos_csv(ruta: str = "ventas.csv") -> List[Dict[str, str]]:
     if not ruta_path.exists():
         raise FileNotFoundError(f"No se encontró el archivo: {ruta}")
 
-    # Leemos con pandas, asegurando dtype str y BOM
-    df = pd.read_csv(ruta_path, dtype=str, encoding='utf-8-sig', keep_default_na=False)
+    if ruta_path.stat().st_size < UMBRAL_CSV_LIVIANO:
+        return _cargar_filas_stdlib(ruta_path)
+
+    import pandas as pd
+
+    # Leemos con pandas, tipando columnas en la propia lectura:
+    # - fecha se parsea como datetime con formato explícito (mucho más
+    #   rápido que inferirlo y sin ambigüedad de día/mes),
+    # - cantidad/precio salen numéricas directo del parser, sin pasadas
+    #   posteriores de astype,
+    # - producto se convierte a category después de limpiarlo (ver abajo):
+    #   los nombres se deduplican a códigos enteros, clave para agrupar por
+    #   producto después.
+    # El motor pyarrow parsea el CSV en paralelo; si pyarrow no está
+    # instalado caemos al motor C de siempre.
+    dtypes = {'producto': str, 'cantidad': 'int32', 'precio': 'float64'}
+    try:
+        df = pd.read_csv(
+            ruta_path,
+            dtype=dtypes,
+            parse_dates=['fecha'],
+            date_format='%Y-%m-%d',
+            encoding='utf-8-sig',
+            engine='pyarrow',
+        )
+    except ImportError:
+        df = pd.read_csv(
+            ruta_path,
+            dtype=dtypes,
+            parse_dates=['fecha'],
+            date_format='%Y-%m-%d',
+            encoding='utf-8-sig',
+            skipinitialspace=True,
+        )
 
     # Limpiamos espacios en los nombres de columna
     df.columns = [str(col).strip() for col in df.columns]
-    # Limpiamos espacios en valores
-    df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
+    # Limpiamos espacios en valores (vectorizado por columna, sin applymap por celda)
+    for col in df.select_dtypes(include='object').columns:
+        df[col] = df[col].str.strip()
+    # El cast a category va después del strip: así "A" y "A " colapsan en la
+    # misma categoría en lugar de romper por categorías duplicadas
+    df['producto'] = df['producto'].astype('category')
 
-    # Convertimos a lista de dicts
-    filas = df.to_dict(orient='records')
-    df['mes'] = df['fecha'].dt.to_period('M')
+    # Cast directo del buffer int64 de fechas al mes (datetime64[M]):
+    # una pasada de NumPy sin construir un Period por fila.
+    df['mes'] = df['fecha'].values.astype('datetime64[M]')
 
-    ventas_por_mes = df.groupby('mes').apply(lambda d: (d['cantidad'] * d['precio']).sum())
+    # Una sola multiplicación vectorizada sobre toda la columna; la suma
+    # agrupada queda a cargo de calcular_ventas_por_mes.
+    df['ingreso'] = df['cantidad'] * df['precio']
+    return df
 
-    ventas_por_mes = ventas_por_mes.sort_index()
 
-    print("Ventas por mes:")
+def iter_rows(df: pd.DataFrame):
+    """Itera las filas del DataFrame como tuplas (para quien necesite dicts/filas).
 
-    print(ventas_por_mes)
-    return filas
+    itertuples es mucho más rápido que to_dict(orient='records') y solo
+    asigna una tupla por fila.
+    """
+    return df.itertuples(index=False, name=None)
 
 
 # 2. Calcular ventas totales por mes
 # -----------------------------------------------------------------------------
-# Implementaremos funciones para agrupar por mes y sumar ventas.
+
+
+def calcular_ventas_por_mes(datos):
+    """Suma cantidad * precio por mes.
+
+    Acepta las dos formas que devuelve cargar_datos_csv: lista de filas
+    (devuelve dict mes -> total) o DataFrame (devuelve Series indexada por mes,
+    agregada en C sin lambdas por grupo).
+    """
+    if isinstance(datos, list):
+        ventas_por_mes: Dict[str, float] = {}
+        for fila in datos:
+            mes = fila['fecha'][:7]  # AAAA-MM
+            ventas_por_mes[mes] = ventas_por_mes.get(mes, 0.0) + int(fila['cantidad']) * float(fila['precio'])
+        return ventas_por_mes
+
+    return datos.groupby('mes', sort=True, observed=True)['ingreso'].sum()
+
+
+def reporte(datos) -> None:
+    """Imprime el reporte de ventas por mes con una sola escritura a stdout.
+
+    Componer el texto completo y escribirlo de una vez evita el write/flush
+    por línea de múltiples print().
+    """
+    ventas_por_mes = calcular_ventas_por_mes(datos)
+    if isinstance(ventas_por_mes, dict):
+        cuerpo = "\n".join(f"{mes}    {ventas_por_mes[mes]}" for mes in sorted(ventas_por_mes))
+    else:
+        # El formato AAAA-MM se aplica solo al mostrar, no sobre los datos
+        cuerpo = ventas_por_mes.rename(index=lambda mes: mes.strftime('%Y-%m')).to_string()
+    sys.stdout.write("Ventas por mes:\n" + cuerpo + "\n")
 
 
 # 3. Determinar producto más vendido y con mayor ingresos
@@ -66,6 +161,7 @@ if __name__ == "__main__":
     # Ejecución manual rápida del paso 1 para validar carga
     try:
         datos = cargar_datos_csv()
+        reporte(datos)
         print(f"Filas cargadas: {len(datos)}")
     except Exception as exc:
         print(f"Error cargando CSV: {exc}")